@@ -1 +1,14 @@
 # Data Package
+import functools
+from pathlib import Path
+from typing import Any, Dict, List
+
+import orjson
+
+SAMPLES_PATH = Path(__file__).parent / "samples.json"
+
+
+@functools.lru_cache(maxsize=None)
+def load_samples() -> List[Dict[str, Any]]:
+    """Parse samples.json once per process; every caller shares the result"""
+    return orjson.loads(SAMPLES_PATH.read_bytes())["samples"]
@@ -1,20 +1,59 @@
-from fastapi import FastAPI, HTTPException, File, UploadFile
-from fastapi.middleware.cors import CORSMiddleware
-import time
+from fastapi import FastAPI, HTTPException, File, Header, UploadFile, Response
+from fastapi.responses import ORJSONResponse
+from starlette.middleware.gzip import GZipMiddleware
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+import orjson
 import sys
 import os
 import random
+import secrets
 
-# Add current directory to path
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from backend.data import load_samples
+from backend.middleware.cors import FastCORSMiddleware
+from backend.models.schemas import SignalRequest, AnalysisResponse
+from backend.services.prediction import prediction_service
 
-from models.schemas import SignalRequest, AnalysisResponse
-from services.prediction import prediction_service
+# Artificial delay added to predictions for demo realism. Set DEMO_DELAY_MS=0
+# in production deployments to disable it.
+DEMO_DELAY_SECONDS = int(os.environ.get("DEMO_DELAY_MS", "1500")) / 1000
+
+# Admin endpoints are disabled unless ADMIN_TOKEN is set; callers must send
+# it in the X-Admin-Token header
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN")
+
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024  # 10 MB
+UPLOAD_CHUNK_BYTES = 64 * 1024
+
+def _precompute_predictions() -> Dict[str, bytes]:
+    """
+    Serialize the prediction for every known sample.
+    
+    Synthetic results are deterministic per sample_id, so the predict
+    endpoints only need a dict lookup at request time.
+    """
+    sample_ids = [s["id"] for s in prediction_service.samples_db]
+    return {
+        # Python-mode dump keeps the series as ndarrays; orjson encodes them
+        # directly instead of going through Pydantic's list serializer
+        sample_id: orjson.dumps(result.model_dump(), option=orjson.OPT_SERIALIZE_NUMPY)
+        for sample_id, result in zip(sample_ids, prediction_service.predict_batch(sample_ids))
+    }
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Precompute all sample predictions before serving requests"""
+    app.state.prediction_bytes = _precompute_predictions()
+    yield
 
 app = FastAPI(
     title="CosmicOptic API",
     description="Exoplanet detection ML service powered by CosmicNet",
-    version="1.0.0"
+    version="1.0.0",
+    # orjson is much faster than stdlib json on the large float arrays we return
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # CORS - allow frontend to connect
@@ -31,13 +70,16 @@ else:
     allow_origins = ["*"]
 
 app.add_middleware(
-    CORSMiddleware,
+    FastCORSMiddleware,
     allow_origins=allow_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+# Predict responses are ~60-80 KB of JSON floats; compress anything over 1 KB
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 @app.get("/")
 def root():
     """Health check endpoint"""
@@ -48,27 +90,26 @@ def root():
         "model_status": "CosmicNet-v1.0"
     }
 
-@app.post("/api/predict", response_model=AnalysisResponse)
-async def predict_exoplanet(request: SignalRequest):
+# Responses are pre-serialized bytes, so no response_model validation at
+# runtime; AnalysisResponse is only declared for the OpenAPI docs
+@app.post("/api/predict", response_model=None, responses={200: {"model": AnalysisResponse}})
+async def predict_exoplanet(request: SignalRequest) -> Response:
     """
     Analyze a stellar light curve signal.
     
     Returns classification and visualization data.
     """
-    try:
-        # Add artificial delay for demo realism (remove in production)
-        time.sleep(1.5)
-        
-        result = prediction_service.predict(request.sample_id)
-        return result
-        
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
+    blob = app.state.prediction_bytes.get(request.sample_id)
+    if blob is None:
+        raise HTTPException(status_code=404, detail=f"Sample {request.sample_id} not found")
+    
+    # Add artificial delay for demo realism (non-blocking, see DEMO_DELAY_MS)
+    await asyncio.sleep(DEMO_DELAY_SECONDS)
+    
+    return Response(content=blob, media_type="application/json")
 
-@app.post("/api/predict/upload", response_model=AnalysisResponse)
-async def predict_uploaded_file(file: UploadFile = File(...)):
+@app.post("/api/predict/upload", response_model=None, responses={200: {"model": AnalysisResponse}})
+async def predict_uploaded_file(file: UploadFile = File(...)) -> Response:
     """
     📂 PLACEHOLDER: Accept uploaded file and return random prediction
     
@@ -86,29 +127,30 @@ async def predict_uploaded_file(file: UploadFile = File(...)):
                 detail=f"Invalid file type. Allowed: {', '.join(allowed_extensions)}"
             )
         
-        # Validate file size (10MB max)
-        contents = await file.read()
-        file_size = len(contents)
-        if file_size > 10 * 1024 * 1024:  # 10 MB
+        # Validate file size (10MB max). The multipart parser records the size
+        # of the spooled upload; otherwise stream it in chunks instead of
+        # buffering the whole file in memory
+        file_size = file.size
+        if file_size is None:
+            file_size = 0
+            while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+                file_size += len(chunk)
+                if file_size > MAX_UPLOAD_BYTES:
+                    break
+        if file_size > MAX_UPLOAD_BYTES:
             raise HTTPException(
                 status_code=400,
                 detail="File too large. Maximum size is 10 MB."
             )
         
         # PLACEHOLDER: Pick random sample and return its prediction
-        sample_ids = [
-            "kepler-186f", "kepler-452b", "trappist-1e",
-            "koi-5123", "koi-8888",
-            "eb-001", "var-002", "noise-003"
-        ]
-        random_sample = random.choice(sample_ids)
+        random_sample = random.choice(list(app.state.prediction_bytes))
         
         # Add artificial delay for demo realism
-        time.sleep(1.5)
+        await asyncio.sleep(DEMO_DELAY_SECONDS)
         
         # Return prediction as if it came from the uploaded file
-        result = prediction_service.predict(random_sample)
-        return result
+        return Response(content=app.state.prediction_bytes[random_sample], media_type="application/json")
         
     except HTTPException:
         raise
@@ -135,28 +177,48 @@ def get_model_metrics():
         "dataset": "Kepler + K2 + TESS"
     }
 
-@app.get("/api/samples")
-def list_samples():
-    """Get list of available sample signals"""
-    import json
-    from pathlib import Path
-    
-    data_path = Path(__file__).parent / "data" / "samples.json"
-    with open(data_path) as f:
-        samples = json.load(f)["samples"]
+@app.post("/api/admin/cache/clear")
+def clear_prediction_cache(x_admin_token: Optional[str] = Header(None)):
+    """Recompute the served sample predictions (requires X-Admin-Token)"""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_admin_token is None or not secrets.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
     
-    # Return simplified list (don't leak truth labels to frontend)
-    return {
-        "samples": [
-            {
-                "id": s["id"],
-                "name": s["name"],
-                "description": s["description"]
-            }
-            for s in samples
-        ]
-    }
+    # The swap is a single assignment, so in-flight requests see either the
+    # old or the new mapping
+    prediction_service.clear_cache()
+    app.state.prediction_bytes = _precompute_predictions()
+    return {"status": "cleared"}
+
+# Sample list is static, so serialize the public payload once at startup
+# (skips FastAPI's jsonable_encoder walk on every request)
+# Return simplified list (don't leak truth labels to frontend)
+SAMPLES_JSON = orjson.dumps({
+    "samples": [
+        {
+            "id": s["id"],
+            "name": s["name"],
+            "description": s["description"]
+        }
+        for s in load_samples()
+    ]
+})
+
+@app.get("/api/samples", response_model=None)
+def list_samples() -> Response:
+    """Get list of available sample signals"""
+    return Response(content=SAMPLES_JSON, media_type="application/json")
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # uvloop + httptools (both from uvicorn[standard]) are considerably faster
+    # than the asyncio/h11 defaults; uvloop is not available on Windows.
+    # Production equivalent: uvicorn backend.main:app --loop uvloop --http httptools
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools"
+    )
@@ -0,0 +1,157 @@
+"""
+CORS Middleware
+Minimal pure-ASGI CORS handling with all static header bytes built once at startup
+"""
+
+from typing import Iterable, List, Tuple
+
+ALL_METHODS = ("DELETE", "GET", "HEAD", "OPTIONS", "PATCH", "POST", "PUT")
+
+Header = Tuple[bytes, bytes]
+
+
+def _add_vary_origin(headers: List[Header]) -> None:
+    """In place: merge Origin into an existing Vary header, or add one"""
+    for i, (name, value) in enumerate(headers):
+        if name.lower() == b"vary":
+            headers[i] = (name, value + b", Origin")
+            return
+    headers.append((b"vary", b"Origin"))
+
+
+class FastCORSMiddleware:
+    """
+    Drop-in replacement for Starlette's CORSMiddleware for our simple setup
+
+    Every header value that does not depend on the request is encoded to
+    bytes in __init__, so the per-request work is a single scan of the
+    request headers plus a list concatenation on the response start.
+    """
+
+    __slots__ = (
+        "app", "_allow_all_origins", "_allow_origins", "_allow_all_headers",
+        "_allow_headers", "_allow_methods", "_mirror_origin", "_allow_methods_bytes",
+        "_allow_headers_bytes", "_max_age_bytes", "_simple_headers", "_preflight_headers",
+    )
+
+    def __init__(
+        self,
+        app,
+        allow_origins: Iterable[str] = (),
+        allow_methods: Iterable[str] = ALL_METHODS,
+        allow_headers: Iterable[str] = ("*",),
+        allow_credentials: bool = False,
+        max_age: int = 600
+    ):
+        self.app = app
+
+        allow_origins = list(allow_origins)
+        allow_methods = list(allow_methods)
+        allow_headers = list(allow_headers)
+        if "*" in allow_methods:
+            allow_methods = list(ALL_METHODS)
+
+        self._allow_all_origins = "*" in allow_origins
+        self._allow_origins = frozenset(o.encode("latin-1") for o in allow_origins)
+        self._allow_all_headers = "*" in allow_headers
+        self._allow_headers = frozenset(h.lower().encode("latin-1") for h in allow_headers)
+        self._allow_methods = frozenset(m.encode("latin-1") for m in allow_methods)
+
+        # Browsers reject a literal "*" on credentialed requests, so the
+        # request origin is echoed back whenever credentials are allowed
+        self._mirror_origin = allow_credentials or not self._allow_all_origins
+
+        self._allow_methods_bytes = ", ".join(allow_methods).encode("latin-1")
+        self._allow_headers_bytes = ", ".join(allow_headers).encode("latin-1")
+        self._max_age_bytes = str(max_age).encode("latin-1")
+
+        common: List[Header] = []
+        if allow_credentials:
+            common.append((b"access-control-allow-credentials", b"true"))
+        if not self._mirror_origin:
+            common.append((b"access-control-allow-origin", b"*"))
+
+        # Vary: Origin for simple responses is merged into the app's own Vary
+        # header at send time; preflights are answered here, so it is static
+        self._simple_headers = common
+        self._preflight_headers = common + [
+            (b"access-control-allow-methods", self._allow_methods_bytes),
+            (b"access-control-max-age", self._max_age_bytes),
+        ]
+        if self._mirror_origin:
+            self._preflight_headers.append((b"vary", b"Origin"))
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = request_method = request_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            await self._preflight_response(send, origin, request_method, request_headers)
+            return
+
+        if not (self._allow_all_origins or origin in self._allow_origins):
+            await self.app(scope, receive, send)
+            return
+
+        extra_headers = self._simple_headers
+        mirror_origin = self._mirror_origin
+        if mirror_origin:
+            extra_headers = extra_headers + [(b"access-control-allow-origin", origin)]
+
+        async def send_with_cors(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", ()))
+                if mirror_origin:
+                    _add_vary_origin(headers)
+                message["headers"] = headers + extra_headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+    async def _preflight_response(self, send, origin: bytes, request_method: bytes, request_headers):
+        """Answer a CORS preflight request directly without invoking the app"""
+        failures = []
+        if not (self._allow_all_origins or origin in self._allow_origins):
+            failures.append("origin")
+        if request_method not in self._allow_methods:
+            failures.append("method")
+
+        headers = list(self._preflight_headers)
+        if self._mirror_origin:
+            headers.append((b"access-control-allow-origin", origin))
+
+        if request_headers is not None:
+            if self._allow_all_headers:
+                headers.append((b"access-control-allow-headers", request_headers))
+            else:
+                requested = (h.strip().lower() for h in request_headers.split(b","))
+                if any(h and h not in self._allow_headers for h in requested):
+                    failures.append("headers")
+                headers.append((b"access-control-allow-headers", self._allow_headers_bytes))
+
+        if failures:
+            status = 400
+            body = ("Disallowed CORS " + ", ".join(failures)).encode("latin-1")
+        else:
+            status = 200
+            body = b"OK"
+
+        headers.append((b"content-type", b"text/plain; charset=utf-8"))
+        headers.append((b"content-length", str(len(body)).encode("latin-1")))
+
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
@@ -1,15 +1,43 @@
-from pydantic import BaseModel, Field
-from typing import List, Dict, Optional
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field, PlainSerializer, PlainValidator, WithJsonSchema
+from typing import Annotated, List, Dict, Optional
+
+def _finite_float_array(value) -> np.ndarray:
+    """
+    Coerce to a read-only float64 array, replacing NaN/Infinity so it stays
+    JSON-safe (read-only so frozen models sharing it stay immutable)
+    """
+    array = np.asarray(value, dtype=np.float64)
+    if not np.isfinite(array).all():
+        array = np.nan_to_num(array, nan=0.0, posinf=1e10, neginf=-1e10)
+    # Freeze a view, not the caller's own array
+    array = array.view()
+    array.flags.writeable = False
+    return array
+
+# Large per-point series stay NumPy arrays on the model: model_dump() returns
+# the arrays as-is (for orjson with OPT_SERIALIZE_NUMPY), and only Pydantic's
+# own JSON serialization converts them to lists
+FloatArray = Annotated[
+    np.ndarray,
+    PlainValidator(_finite_float_array),
+    PlainSerializer(lambda v: v.tolist(), return_type=List[float], when_used="json"),
+    WithJsonSchema({"type": "array", "items": {"type": "number"}}),
+]
 
 class SignalRequest(BaseModel):
     sample_id: str = Field(..., description="ID of the stellar signal to analyze")
     
 class TransitRegion(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     start_index: int
     end_index: int
     depth: float
     
 class AnalysisMetadata(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     orbital_period: Optional[float] = None
     transit_duration: Optional[float] = None  # in hours
     planet_radius: Optional[float] = None  # Earth radii
@@ -18,14 +46,17 @@ class AnalysisMetadata(BaseModel):
 
 class SHAPExplanation(BaseModel):
     """SHAP explainability data for model interpretability"""
-    feature_importance: List[float] = Field(..., description="SHAP values for each time point")
+    model_config = ConfigDict(frozen=True)
+    
+    feature_importance: FloatArray = Field(..., description="SHAP values for each time point")
     top_contributing_regions: List[Dict[str, float]] = Field(..., description="Most important transit regions")
     explanation_summary: str = Field(..., description="Human-readable explanation")
     base_value: float = Field(..., description="Expected value without features")
     predicted_value: float = Field(..., description="Final prediction value")
     
 class AnalysisResponse(BaseModel):
-    model_config = {"protected_namespaces": ()}
+    # Nested models are cached and shared between responses, so all response models are frozen
+    model_config = ConfigDict(protected_namespaces=(), frozen=True)
     
     # Core classification - BINARY: Exoplanet or None
     classification: str = Field(..., description="exoplanet | no_planet")
@@ -33,8 +64,8 @@ class AnalysisResponse(BaseModel):
     class_probabilities: Dict[str, float] = Field(..., description="Probabilities for exoplanet and no_planet")
     
     # Visualization data
-    light_curve_data: List[float] = Field(..., description="Normalized flux values")
-    time_points: List[float] = Field(..., description="Time in days")
+    light_curve_data: FloatArray = Field(..., description="Normalized flux values")
+    time_points: FloatArray = Field(..., description="Time in days")
     highlighted_regions: List[TransitRegion] = Field(default=[])
     
     # Metadata
@@ -0,0 +1,68 @@
+# cython: language_level=3
+"""
+Compiled float sanitizer
+Same semantics as the pure-Python walker in prediction.py, which is used
+whenever this extension has not been built. ndarrays are left alone: FloatArray
+validation cleans them once.
+
+Build in place (from the repo root):
+    pip install cython && cythonize -i backend/services/_sanitize.pyx
+"""
+
+from cpython.float cimport PyFloat_AS_DOUBLE, PyFloat_Check, PyFloat_CheckExact
+from libc.math cimport isinf, isnan
+
+import numpy as np
+
+cdef object _floating = np.floating
+cdef object _integer = np.integer
+
+
+cdef object _clean(object value, list pending):
+    """Return the sanitized value (the same object if nothing changed)"""
+    cdef double x
+    if PyFloat_Check(value):
+        # Replace NaN with 0.0, Infinity with large finite numbers
+        x = PyFloat_AS_DOUBLE(value)
+        if isnan(x):
+            return 0.0
+        if isinf(x):
+            return 1e10 if x > 0 else -1e10
+        if PyFloat_CheckExact(value):
+            return value
+        return x
+    if isinstance(value, (dict, list)):
+        pending.append(value)
+        return value
+    if isinstance(value, _floating):
+        x = float(value)
+        if isnan(x):
+            return 0.0
+        if isinf(x):
+            return 1e10 if x > 0 else -1e10
+        return x
+    if isinstance(value, _integer):
+        return int(value)
+    return value
+
+
+cpdef object sanitize(object data):
+    """Sanitize all float values in nested dictionaries/lists (in place)"""
+    cdef list root = [data]
+    cdef list pending = [root]
+    cdef object container, key, value, cleaned
+    cdef Py_ssize_t i
+    while pending:
+        container = pending.pop()
+        if isinstance(container, dict):
+            for key, value in (<dict>container).items():
+                cleaned = _clean(value, pending)
+                if cleaned is not value:
+                    (<dict>container)[key] = cleaned
+        else:
+            for i in range(len(<list>container)):
+                value = (<list>container)[i]
+                cleaned = _clean(value, pending)
+                if cleaned is not value:
+                    (<list>container)[i] = cleaned
+    return root[0]
@@ -1,9 +1,102 @@
 import numpy as np
+from numba import njit
 from typing import Tuple, List
 
+# Shared PCG64 generator for callers that don't need reproducible noise
+_RNG = np.random.default_rng()
+
+# 30-day observation time grid, shared read-only by all default-length curves
+DEFAULT_NUM_POINTS = 1000
+_TIME_GRID = np.linspace(0, 30, DEFAULT_NUM_POINTS)
+_TIME_GRID.flags.writeable = False
+
+
+def _time_grid(num_points: int) -> np.ndarray:
+    """Observation times in days (read-only for the default length)"""
+    if num_points == DEFAULT_NUM_POINTS:
+        return _TIME_GRID
+    return np.linspace(0, 30, num_points)
+
+
+def _noisy_baseline(rng: np.random.Generator, num_points: int, noise_std: float,
+                    out: np.ndarray = None) -> np.ndarray:
+    """Constant brightness of 1.0 plus Gaussian noise, built in a single buffer (out if given)"""
+    flux = rng.standard_normal(num_points, out=out)
+    flux *= noise_std
+    flux += 1.0
+    return flux
+
+
+def _finite(flux: np.ndarray) -> np.ndarray:
+    """In place: replace NaN/Infinity so generated flux is always JSON-safe"""
+    return np.nan_to_num(flux, copy=False, nan=0.0, posinf=1e10, neginf=-1e10)
+
+
+# Binary eclipse times in days (V-shaped, 0.5 day half-width)
+_ECLIPSE_CENTERS = np.array([7.0, 14.0, 21.0])
+
+
+@njit(cache=True, nogil=True)
+def _apply_limb_darkened_transits(time, flux, in_transit, depth_out,
+                                  period_days, transit_width, transit_depth):
+    """
+    In place: subtract periodic transits centered on phase 0.5 from flux,
+    marking in_transit and each point's transit depth in depth_out
+    """
+    half_width = transit_width / 2
+    for i in range(time.shape[0]):
+        phase = (time[i] % period_days) / period_days
+        if 0.5 - half_width < phase < 0.5 + half_width:
+            # Box-shaped transit with smooth edges (limb darkening approximation)
+            relative_phase = (phase - 0.5) / half_width  # -1 to 1
+            limb_factor = 1.0 - 0.1 * (1 - relative_phase * relative_phase)  # Slight U-shape
+            depth_factor = transit_depth * limb_factor * (1 - abs(relative_phase) * 0.2)  # Smooth edges
+            flux[i] -= depth_factor
+            in_transit[i] = True
+            depth_out[i] = depth_factor
+        else:
+            in_transit[i] = False
+            depth_out[i] = 0.0
+
+
+@njit(cache=True, nogil=True)
+def _apply_v_eclipses(time, flux, centers, half_width, depth):
+    """In place: subtract V-shaped eclipses of the given depth at each center time"""
+    for k in range(centers.shape[0]):
+        for i in range(time.shape[0]):
+            distance = abs(time[i] - centers[k])
+            if distance < half_width:
+                flux[i] -= depth * (1 - distance / half_width)
+
+
+@njit(cache=True, nogil=True)
+def _apply_box_transit(time, flux, period_days, phase_start, phase_end, depth):
+    """In place: subtract a constant depth wherever the phase is inside the window"""
+    for i in range(time.shape[0]):
+        phase = (time[i] % period_days) / period_days
+        if phase_start < phase < phase_end:
+            flux[i] -= depth
+
+
+def compile_kernels():
+    """JIT-compile (or load from cache) the numeric kernels ahead of the first request"""
+    # Numba specializes on array writeability: warm up with the same
+    # read-only time grid that real requests pass
+    time = _time_grid(DEFAULT_NUM_POINTS)
+    flux = np.ones(DEFAULT_NUM_POINTS)
+    _apply_limb_darkened_transits(
+        time, flux, np.empty(DEFAULT_NUM_POINTS, dtype=np.bool_), np.empty(DEFAULT_NUM_POINTS),
+        1.0, 0.04, 0.01
+    )
+    _apply_v_eclipses(time, flux, _ECLIPSE_CENTERS, 0.5, 0.05)
+    _apply_box_transit(time, flux, 1.0, 0.48, 0.52, 0.005)
+
+
 class SyntheticLightCurveGenerator:
     """Generates realistic exoplanet transit light curves"""
     
+    __slots__ = ()
+    
     @staticmethod
     def calculate_realistic_depth(planet_radius_earth: float, star_radius_solar: float = 1.0) -> float:
         """
@@ -36,13 +129,20 @@ class SyntheticLightCurveGenerator:
         period_days: float = 3.5,
         transit_depth: float = 0.01,
         transit_duration: float = 3.0,
-        num_points: int = 1000,
-        planet_radius_earth: float = None
-    ) -> Tuple[List[float], List[float], List[dict]]:
+        num_points: int = DEFAULT_NUM_POINTS,
+        planet_radius_earth: float = None,
+        rng: np.random.Generator = None,
+        out: np.ndarray = None
+    ) -> Tuple[np.ndarray, np.ndarray, List[dict]]:
         """
         Generate a clean planetary transit signal
+        Pass a seeded rng for a reproducible signal, and out (num_points long)
+        to fill an existing flux buffer instead of allocating one
         Returns: (time_points, flux_values, transit_regions)
         """
+        if rng is None:
+            rng = _RNG
+        
         # If planet_radius provided, calculate realistic depth
         if planet_radius_earth is not None:
             transit_depth = SyntheticLightCurveGenerator.calculate_realistic_depth(
@@ -53,106 +153,96 @@ class SyntheticLightCurveGenerator:
             if transit_depth < 0.0005:
                 transit_depth *= 100  # Make Earth-sized planets detectable in demo
         
-        time = np.linspace(0, 30, num_points)  # 30 days of observation
-        flux = np.ones(num_points)  # Start with constant brightness
-        
-        # Add stellar noise (small variations)
-        noise = np.random.normal(0, 0.0005, num_points)
-        flux += noise
+        time = _time_grid(num_points)  # 30 days of observation
+        # Constant brightness plus stellar noise (small variations)
+        flux = _noisy_baseline(rng, num_points, 0.0005, out)
         
         # Add periodic transits with realistic duration
         transit_regions = []
         # Transit duration as fraction of orbital period (typically 2-5%)
         transit_width = min(0.04, transit_duration / (period_days * 24))  # Convert hours to days
         
-        for i, t in enumerate(time):
-            phase = (t % period_days) / period_days
-            # Transit occurs around phase = 0.5
-            phase_start = 0.5 - transit_width / 2
-            phase_end = 0.5 + transit_width / 2
-            
-            if phase_start < phase < phase_end:
-                # Create box-shaped transit with smooth edges (limb darkening approximation)
-                # U-shaped bottom for realism
-                relative_phase = (phase - 0.5) / (transit_width / 2)  # -1 to 1
-                limb_factor = 1.0 - 0.1 * (1 - relative_phase**2)  # Slight U-shape
-                depth_factor = transit_depth * limb_factor * (1 - abs(relative_phase) * 0.2)  # Smooth edges
-                flux[i] -= depth_factor
-                
-                # Record transit region
-                if not transit_regions or transit_regions[-1]['end_index'] < i - 10:
-                    transit_regions.append({
-                        'start_index': i,
-                        'end_index': i,
-                        'depth': depth_factor
-                    })
-                else:
-                    transit_regions[-1]['end_index'] = i
-                    transit_regions[-1]['depth'] = max(
-                        transit_regions[-1]['depth'], 
-                        depth_factor
-                    )
-        
-        return time.tolist(), flux.tolist(), transit_regions
+        # Transit occurs around phase = 0.5
+        in_transit = np.empty(num_points, dtype=np.bool_)
+        depth_factor = np.empty(num_points)
+        _apply_limb_darkened_transits(
+            time, flux, in_transit, depth_factor, period_days, transit_width, transit_depth
+        )
+        
+        # Record transit regions: in-transit points at most 10 samples apart
+        # belong to the same region
+        transit_indices = np.flatnonzero(in_transit)
+        if transit_indices.size:
+            breaks = np.flatnonzero(np.diff(transit_indices) > 10) + 1
+            starts = transit_indices[np.concatenate(([0], breaks))]
+            ends = transit_indices[np.concatenate((breaks - 1, [transit_indices.size - 1]))]
+            depths = np.maximum.reduceat(depth_factor[transit_indices], np.concatenate(([0], breaks)))
+            transit_regions = [
+                {'start_index': int(start), 'end_index': int(end), 'depth': float(depth)}
+                for start, end, depth in zip(starts, ends, depths)
+            ]
+        
+        return time, _finite(flux), transit_regions
     
     @staticmethod
     def generate_false_positive(
-        num_points: int = 1000,
-        anomaly_type: str = "eclipsing_binary"
-    ) -> Tuple[List[float], List[float], List[dict]]:
+        num_points: int = DEFAULT_NUM_POINTS,
+        anomaly_type: str = "eclipsing_binary",
+        rng: np.random.Generator = None,
+        out: np.ndarray = None
+    ) -> Tuple[np.ndarray, np.ndarray, List[dict]]:
         """
-        Generate false positive signals
+        Generate false positive signals (flux written to out if given)
         - eclipsing_binary: Deep, V-shaped dips
         - stellar_variability: Irregular brightness changes
         - noise: Just random noise
         """
-        time = np.linspace(0, 30, num_points)
-        flux = np.ones(num_points)
+        if rng is None:
+            rng = _RNG
+        
+        time = _time_grid(num_points)
         
         if anomaly_type == "eclipsing_binary":
             # Deep, V-shaped eclipses (not planet-like)
-            noise = np.random.normal(0, 0.001, num_points)
-            flux += noise
+            flux = _noisy_baseline(rng, num_points, 0.001, out)
             
-            for t_center in [7, 14, 21]:  # Binary eclipses
-                mask = np.abs(time - t_center) < 0.5
-                flux[mask] -= 0.05 * (1 - np.abs(time[mask] - t_center) / 0.5)
+            _apply_v_eclipses(time, flux, _ECLIPSE_CENTERS, 0.5, 0.05)  # Binary eclipses
             
-            return time.tolist(), flux.tolist(), []
+            return time, _finite(flux), []
         
         elif anomaly_type == "stellar_variability":
             # Slow, sinusoidal variations (star pulsation)
-            flux += 0.02 * np.sin(2 * np.pi * time / 10)
-            flux += np.random.normal(0, 0.003, num_points)
-            return time.tolist(), flux.tolist(), []
+            flux = np.sin(2 * np.pi * time / 10, out=out)
+            flux *= 0.02
+            flux += 1.0
+            flux += rng.standard_normal(num_points) * 0.003
+            return time, _finite(flux), []
         
         else:  # pure noise
-            flux += np.random.normal(0, 0.005, num_points)
-            return time.tolist(), flux.tolist(), []
+            flux = _noisy_baseline(rng, num_points, 0.005, out)
+            return time, _finite(flux), []
     
     @staticmethod
     def generate_candidate(
-        num_points: int = 1000
-    ) -> Tuple[List[float], List[float], List[dict]]:
+        num_points: int = DEFAULT_NUM_POINTS,
+        rng: np.random.Generator = None,
+        out: np.ndarray = None
+    ) -> Tuple[np.ndarray, np.ndarray, List[dict]]:
         """
         Generate ambiguous signal (noisy planet or unclear data)
+        Flux is written to out if given
         """
-        time = np.linspace(0, 30, num_points)
-        flux = np.ones(num_points)
+        if rng is None:
+            rng = _RNG
         
+        time = _time_grid(num_points)
         # High noise
-        noise = np.random.normal(0, 0.003, num_points)
-        flux += noise
+        flux = _noisy_baseline(rng, num_points, 0.003, out)
         
         # Weak transit signal
         period_days = 5.2
         transit_depth = 0.005  # Very shallow
         
-        transit_regions = []
-        for i, t in enumerate(time):
-            phase = (t % period_days) / period_days
-            if 0.48 < phase < 0.52:
-                depth_factor = transit_depth
-                flux[i] -= depth_factor
+        _apply_box_transit(time, flux, period_days, 0.48, 0.52, transit_depth)
         
-        return time.tolist(), flux.tolist(), transit_regions
+        return time, _finite(flux), []
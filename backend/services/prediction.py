@@ -4,29 +4,100 @@ This is the ONLY file that changes when real model arrives.
 Keep the interface stable!
 """
 
-import time
-import json
-from pathlib import Path
-from typing import Dict, Any
-import sys
+import math
 import os
+import time
+import zlib
+from collections import deque
+from typing import Dict, Any, List, Tuple
+import numpy as np
+from pydantic import TypeAdapter
+
+from backend.data import load_samples
+from backend.models.schemas import AnalysisResponse, AnalysisMetadata, TransitRegion, SHAPExplanation
+from backend.services.data_generator import DEFAULT_NUM_POINTS, SyntheticLightCurveGenerator, compile_kernels
+from backend.services.explainer import shap_explainer, compile_kernels as compile_explainer_kernels
+
+# Generators and the explainer only emit finite values, so the full result
+# walk is an opt-in safety net. Set COSMIC_SANITIZE=1 to enable it
+SANITIZE_RESULTS = os.environ.get("COSMIC_SANITIZE", "0") == "1"
+
+def _make_sanitizer():
+    """
+    Build the float sanitizer with its hot-path names bound in the closure
+    (cheaper than global + attribute lookups for every value visited)
+    """
+    isnan = math.isnan
+    isinf = math.isinf
+    containers = (dict, list)
+    floating = (float, np.floating)
+    integer = np.integer
+    
+    def sanitize(data: Any) -> Any:
+        # Walk with an explicit worklist instead of recursion and patch
+        # values in place: the result dicts are built per request and owned
+        # by the caller. Boxing the input lets a bare leaf be patched too.
+        # ndarrays are left alone: FloatArray validation cleans them once
+        root = [data]
+        pending = deque((root,))
+        while pending:
+            container = pending.pop()
+            items = container.items() if isinstance(container, dict) else enumerate(container)
+            for key, value in items:
+                if isinstance(value, containers):
+                    pending.append(value)
+                elif isinstance(value, floating):
+                    # Replace NaN with 0.0, Infinity with large finite numbers
+                    if isnan(value):
+                        container[key] = 0.0
+                    elif isinf(value):
+                        container[key] = 1e10 if value > 0 else -1e10
+                    elif type(value) is not float:
+                        container[key] = float(value)
+                elif isinstance(value, integer):
+                    container[key] = int(value)
+        return root[0]
+    
+    return sanitize
+
+
+try:
+    # Compiled walker, if it has been built (see _sanitize.pyx)
+    from backend.services._sanitize import sanitize as _sanitize_floats
+except ImportError:
+    _sanitize_floats = _make_sanitizer()
+
 
-# Add parent directory to path for imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Validates a whole region list against one compiled schema
+_REGIONS_ADAPTER = TypeAdapter(List[TransitRegion])
 
-from models.schemas import AnalysisResponse, AnalysisMetadata, TransitRegion, SHAPExplanation
-from services.data_generator import SyntheticLightCurveGenerator
-from services.explainer import shap_explainer
 
 class PredictionService:
     def __init__(self):
         """Initialize the prediction service"""
-        # Load sample database
-        data_path = Path(__file__).parent.parent / "data" / "samples.json"
-        with open(data_path) as f:
-            self.samples_db = json.load(f)["samples"]
+        # Load sample database (parsed once per process). Shallow copies: the
+        # parsed samples are shared with the API layer and must not pick up
+        # the derived verdict fields below
+        self.samples_db = [dict(sample) for sample in load_samples()]
+        self._samples_by_id = {s["id"]: s for s in self.samples_db}
+        
+        # Synthetic verdicts are deterministic per sample, so work them out once.
+        # _fp is a stable fingerprint of the id (unlike the per-process salted
+        # hash()), used for both the verdict and the noise seed
+        for sample in self.samples_db:
+            sample["_fp"] = zlib.crc32(sample["id"].encode())
+            classification, confidence = self._synthetic_verdict(sample)
+            sample["_classification"] = classification
+            sample["_confidence"] = confidence
+        
+        # Synthetic results are a pure function of the sample (seeded noise),
+        # so the sanitized result dict is kept per sample_id
+        self._response_cache: Dict[str, Dict[str, Any]] = {}
         
         self.generator = SyntheticLightCurveGenerator()
+        # Pay the JIT compile / cache load at boot, not on the first request
+        compile_kernels()
+        compile_explainer_kernels()
         
         # 🔄 FUTURE: Load real model here
         # self.model = joblib.load("models/cosmic_optic_model.joblib")
@@ -38,71 +109,194 @@ class PredictionService:
         🔄 CURRENT: Uses synthetic data generator
         🔄 FUTURE: Will use real ML model
         """
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
+        sample = self._find_sample(sample_id)
+        return self._predict_sample(sample, start_ns)
+    
+    def predict_batch(self, sample_ids: List[str]) -> List[AnalysisResponse]:
+        """
+        Predict several samples in one call, results in input order.
         
-        # Find sample metadata
-        sample = next((s for s in self.samples_db if s["id"] == sample_id), None)
-        if not sample:
-            raise ValueError(f"Sample {sample_id} not found")
+        All ids are resolved up front, so an unknown id raises ValueError
+        before any prediction work is done. Samples computed by this call
+        report an equal share of the measured batched generation/SHAP pass
+        in processing_time_ms; already cached samples only their response time.
+        """
+        samples = [self._find_sample(sample_id) for sample_id in sample_ids]
         
-        # === PHASE 1: SYNTHETIC ===
-        result = self._predict_synthetic(sample)
+        # Explain every uncached sample in one batched SHAP pass; the
+        # results land in the response cache
+        pending = {s["id"]: s for s in samples if s["id"] not in self._response_cache}
+        share_ns = 0
+        if pending:
+            batch_start_ns = time.perf_counter_ns()
+            self._predict_synthetic_batch(list(pending.values()))
+            share_ns = (time.perf_counter_ns() - batch_start_ns) // len(pending)
         
-        # === PHASE 2: REAL MODEL (comment out above, uncomment below) ===
-        # result = self._predict_with_model(sample)
+        return [
+            self._predict_sample(
+                sample, time.perf_counter_ns() - (share_ns if sample["id"] in pending else 0)
+            )
+            for sample in samples
+        ]
+    
+    def _find_sample(self, sample_id: str) -> Dict[str, Any]:
+        """Find sample metadata by id"""
+        sample = self._samples_by_id.get(sample_id)
+        if not sample:
+            raise ValueError(f"Sample {sample_id} not found")
+        return sample
+    
+    def clear_cache(self):
+        """Drop all memoized prediction results"""
+        self._response_cache.clear()
+    
+    def _predict_sample(self, sample: Dict[str, Any], start_ns: int) -> AnalysisResponse:
+        """Run the prediction pipeline for one sample (memoized per sample_id)"""
+        result = self._response_cache.get(sample["id"])
+        if result is None:
+            # === PHASE 1: SYNTHETIC ===
+            result = self._predict_synthetic(sample)
+            
+            # === PHASE 2: REAL MODEL (comment out above, uncomment below) ===
+            # result = self._predict_with_model(sample)
+            
+            # Optional final safety check - sanitize ALL float values before JSON serialization
+            if SANITIZE_RESULTS:
+                result = self._sanitize_floats(result)
+            self._response_cache[sample["id"]] = result
         
         # Add processing time
-        processing_time = int((time.time() - start_time) * 1000)
-        result["processing_time_ms"] = processing_time
+        processing_time = (time.perf_counter_ns() - start_ns) // 1_000_000
         
-        # ✅ CRITICAL: Final safety check - sanitize ALL float values before JSON serialization
-        result = self._sanitize_floats(result)
+        return AnalysisResponse(**result, processing_time_ms=processing_time)
+    
+    @staticmethod
+    def _synthetic_verdict(sample: Dict[str, Any]) -> Tuple[str, float]:
+        """
+        Synthetic BINARY classification and confidence for a sample
+        Maps 3-class truth to 2-class prediction
+        """
+        truth = sample["truth"]
+        if truth == "confirmed":
+            return "exoplanet", 0.90 + (sample["_fp"] % 8) / 100  # 90-98%
         
-        return AnalysisResponse(**result)
+        elif truth == "candidate":
+            # Candidates split: some are exoplanets (70%), some are not (30%)
+            candidate_hash = sample["_fp"] % 100
+            if candidate_hash < 70:
+                # Classify as exoplanet but with lower confidence
+                return "exoplanet", 0.60 + (candidate_hash % 20) / 100  # 60-80%
+            else:
+                # Classify as no_planet (ambiguous signal)
+                return "no_planet", 0.55 + (candidate_hash % 15) / 100  # 55-70%
+        
+        else:  # false_positive
+            return "no_planet", 0.85 + (sample["_fp"] % 12) / 100  # 85-97%
     
     def _predict_synthetic(self, sample: Dict[str, Any]) -> Dict[str, Any]:
         """
         🔄 PHASE 1: Synthetic prediction with BINARY classification
         Remove this method when real model is ready
         """
+        time_points, flux, transit_regions = self._generate_light_curve(sample)
+        
+        # Generate SHAP explanation
+        shap_data = shap_explainer.explain_prediction(
+            light_curve=flux,
+            time_points=time_points,
+            classification=sample["_classification"],
+            confidence=sample["_confidence"],
+            transit_regions=transit_regions
+        )
+        
+        return self._synthetic_result(sample, time_points, flux, transit_regions, shap_data)
+    
+    def _predict_synthetic_batch(self, samples: List[Dict[str, Any]]):
+        """
+        🔄 PHASE 1: Synthetic predictions for several samples with a single
+        batched SHAP pass; results go straight into the response cache
+        """
+        # Every generator fills its row of one preallocated block in place, so
+        # the batch needs no per-sample flux allocations and no stacking copy
+        flux_batch = np.empty((len(samples), DEFAULT_NUM_POINTS))
+        curves = [
+            self._generate_light_curve(sample, out) for sample, out in zip(samples, flux_batch)
+        ]
+        
+        # The batched SHAP pass is only valid if every curve sits on the same
+        # time grid and was written into its own row of flux_batch
+        time_points = curves[0][0]
+        for sample, row, (sample_time, flux, _) in zip(samples, flux_batch, curves):
+            if (sample_time is not time_points
+                    or sample_time.shape != row.shape
+                    or not np.may_share_memory(flux, row)):
+                raise ValueError(
+                    f"Sample {sample['id']} was not generated on the shared "
+                    f"{DEFAULT_NUM_POINTS}-point time grid"
+                )
+        
+        explanations = shap_explainer.explain_batch(
+            flux_batch=flux_batch,
+            time_points=time_points,
+            classifications=[sample["_classification"] for sample in samples],
+            confidences=[sample["_confidence"] for sample in samples],
+            transit_regions=[transit_regions for _, _, transit_regions in curves]
+        )
+        
+        for sample, (time_points, flux, transit_regions), shap_data in zip(samples, curves, explanations):
+            result = self._synthetic_result(sample, time_points, flux, transit_regions, shap_data)
+            if SANITIZE_RESULTS:
+                result = self._sanitize_floats(result)
+            self._response_cache[sample["id"]] = result
+    
+    def _generate_light_curve(
+        self, sample: Dict[str, Any], out: np.ndarray = None
+    ) -> Tuple[np.ndarray, np.ndarray, List[dict]]:
+        """Synthetic (time_points, flux, transit_regions) for a sample's truth label, flux in out if given"""
         truth = sample["truth"]
         params = sample["params"]
         
+        # Seed noise from the sample fingerprint so each sample always yields
+        # the same light curve
+        rng = np.random.default_rng(sample["_fp"])
+        
         # Generate appropriate light curve based on truth label
-        # Map 3-class truth to 2-class prediction
         if truth == "confirmed":
             # Strong exoplanet signal - use realistic transit depth
-            time_points, flux, transit_regions = self.generator.generate_confirmed_planet(
+            return self.generator.generate_confirmed_planet(
                 period_days=params.get("period_days", 10),
                 transit_depth=params.get("transit_depth", 0.01),  # Fallback if no radius
                 transit_duration=params.get("transit_duration", 3),
-                planet_radius_earth=params.get("planet_radius")  # NEW: Calculate from radius
+                planet_radius_earth=params.get("planet_radius"),  # NEW: Calculate from radius
+                rng=rng,
+                out=out
             )
-            classification = "exoplanet"
-            confidence = 0.90 + (hash(sample["id"]) % 8) / 100  # 90-98%
-            
         elif truth == "candidate":
             # Weak exoplanet signal or borderline case
-            time_points, flux, transit_regions = self.generator.generate_candidate()
-            
-            # Candidates split: some are exoplanets (70%), some are not (30%)
-            candidate_hash = hash(sample["id"]) % 100
-            if candidate_hash < 70:
-                # Classify as exoplanet but with lower confidence
-                classification = "exoplanet"
-                confidence = 0.60 + (candidate_hash % 20) / 100  # 60-80%
-            else:
-                # Classify as no_planet (ambiguous signal)
-                classification = "no_planet"
-                confidence = 0.55 + (candidate_hash % 15) / 100  # 55-70%
-            
+            return self.generator.generate_candidate(rng=rng, out=out)
         else:  # false_positive
             # Clear non-planet signal
-            time_points, flux, transit_regions = self.generator.generate_false_positive(
-                anomaly_type=params.get("anomaly_type", "noise")
+            return self.generator.generate_false_positive(
+                anomaly_type=params.get("anomaly_type", "noise"),
+                rng=rng,
+                out=out
             )
-            classification = "no_planet"
-            confidence = 0.85 + (hash(sample["id"]) % 12) / 100  # 85-97%
+    
+    def _synthetic_result(
+        self,
+        sample: Dict[str, Any],
+        time_points: np.ndarray,
+        flux: np.ndarray,
+        transit_regions: List[dict],
+        shap_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Assemble the response fields for a synthetic prediction"""
+        assert np.isfinite(flux).all(), f"Non-finite flux generated for {sample['id']}"
+        
+        params = sample["params"]
+        classification = sample["_classification"]
+        confidence = sample["_confidence"]
         
         # Calculate BINARY class probabilities
         if classification == "exoplanet":
@@ -116,24 +310,13 @@ class PredictionService:
                 "no_planet": confidence
             }
         
-        # Generate SHAP explanation
-        shap_data = shap_explainer.explain_prediction(
-            light_curve=flux,
-            time_points=time_points,
-            classification=classification,
-            confidence=confidence,
-            transit_regions=transit_regions
-        )
-        
         return {
             "classification": classification,
             "confidence_score": confidence,
             "class_probabilities": probs,
             "light_curve_data": flux,
             "time_points": time_points,
-            "highlighted_regions": [
-                TransitRegion(**r) for r in transit_regions
-            ],
+            "highlighted_regions": _REGIONS_ADAPTER.validate_python(transit_regions),
             "analysis": AnalysisMetadata(
                 orbital_period=params.get("period_days"),
                 transit_duration=params.get("transit_duration"),
@@ -141,34 +324,16 @@ class PredictionService:
                 star_name=sample["name"],
                 discovery_method="Transit"
             ),
-            "shap_explanation": SHAPExplanation(**shap_data),
+            "shap_explanation": SHAPExplanation.model_validate(shap_data),
             "model_version": "CosmicNet-v1.0"
         }
     
     def _sanitize_floats(self, data: Any) -> Any:
         """
-        Recursively sanitize all float values in nested dictionaries/lists
+        Sanitize all float values in nested dictionaries/lists (in place)
         to prevent JSON serialization errors from NaN/Infinity values
         """
-        import math
-        import numpy as np
-        
-        if isinstance(data, dict):
-            return {k: self._sanitize_floats(v) for k, v in data.items()}
-        elif isinstance(data, list):
-            return [self._sanitize_floats(item) for item in data]
-        elif isinstance(data, (float, np.floating)):
-            # Replace NaN with 0.0, Infinity with large finite numbers
-            if math.isnan(data):
-                return 0.0
-            elif math.isinf(data):
-                return 1e10 if data > 0 else -1e10
-            else:
-                return float(data)
-        elif isinstance(data, (np.integer,)):
-            return int(data)
-        else:
-            return data
+        return _sanitize_floats(data)
     
     def _predict_with_model(self, sample: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -0,0 +1,122 @@
+"""
+FastCORSMiddleware behaviour
+Mirrors what Starlette's CORSMiddleware does for our configuration
+"""
+
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from backend.middleware.cors import FastCORSMiddleware
+
+
+def _homepage(request):
+    return PlainTextResponse("hello")
+
+
+def _varies(request):
+    return PlainTextResponse("hello", headers={"Vary": "Cookie"})
+
+
+def _client(**options) -> TestClient:
+    app = Starlette(routes=[Route("/", _homepage), Route("/varies", _varies)])
+    return TestClient(FastCORSMiddleware(app, **options))
+
+
+def _preflight(client: TestClient, origin="http://good.example", method="POST", headers=None):
+    request_headers = {"Origin": origin, "Access-Control-Request-Method": method}
+    if headers is not None:
+        request_headers["Access-Control-Request-Headers"] = headers
+    return client.options("/", headers=request_headers)
+
+
+def test_no_origin_passes_through_untouched():
+    client = _client(allow_origins=["*"], allow_credentials=True)
+    response = client.get("/varies")
+
+    assert response.text == "hello"
+    assert response.headers.get_list("vary") == ["Cookie"]
+    assert not any(name.startswith("access-control-") for name in response.headers)
+
+
+def test_vary_is_merged_into_existing_header():
+    client = _client(allow_origins=["*"], allow_credentials=True)
+
+    response = client.get("/varies", headers={"Origin": "http://good.example"})
+    assert response.headers.get_list("vary") == ["Cookie, Origin"]
+
+    response = client.get("/", headers={"Origin": "http://good.example"})
+    assert response.headers.get_list("vary") == ["Origin"]
+
+
+def test_origin_is_mirrored_with_credentials():
+    client = _client(allow_origins=["*"], allow_credentials=True)
+    response = client.get("/", headers={"Origin": "http://good.example"})
+
+    assert response.headers["access-control-allow-origin"] == "http://good.example"
+    assert response.headers["access-control-allow-credentials"] == "true"
+
+
+def test_wildcard_origin_without_credentials():
+    client = _client(allow_origins=["*"])
+    response = client.get("/", headers={"Origin": "http://good.example"})
+
+    assert response.headers["access-control-allow-origin"] == "*"
+    assert "access-control-allow-credentials" not in response.headers
+    assert "vary" not in response.headers
+
+
+def test_disallowed_origin_gets_no_cors_headers():
+    client = _client(allow_origins=["http://good.example"])
+    response = client.get("/", headers={"Origin": "http://evil.example"})
+
+    assert response.text == "hello"
+    assert "access-control-allow-origin" not in response.headers
+
+
+def test_preflight_allowed():
+    client = _client(
+        allow_origins=["http://good.example"], allow_methods=["GET", "POST"],
+        allow_headers=["Content-Type"], allow_credentials=True
+    )
+    response = _preflight(client, headers="content-type")
+
+    assert response.status_code == 200
+    assert response.text == "OK"
+    assert response.headers["access-control-allow-origin"] == "http://good.example"
+    assert response.headers["access-control-allow-methods"] == "GET, POST"
+    assert response.headers["access-control-allow-headers"] == "Content-Type"
+    assert response.headers["vary"] == "Origin"
+
+
+def test_preflight_echoes_requested_headers_when_all_allowed():
+    client = _client(allow_origins=["*"], allow_headers=["*"])
+    response = _preflight(client, headers="x-custom, content-type")
+
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-headers"] == "x-custom, content-type"
+
+
+def test_preflight_rejects_disallowed_origin():
+    client = _client(allow_origins=["http://good.example"])
+    response = _preflight(client, origin="http://evil.example")
+
+    assert response.status_code == 400
+    assert response.text == "Disallowed CORS origin"
+
+
+def test_preflight_rejects_disallowed_method():
+    client = _client(allow_origins=["http://good.example"], allow_methods=["GET"])
+    response = _preflight(client, method="DELETE")
+
+    assert response.status_code == 400
+    assert response.text == "Disallowed CORS method"
+
+
+def test_preflight_rejects_disallowed_header():
+    client = _client(allow_origins=["http://good.example"], allow_headers=["Content-Type"])
+    response = _preflight(client, headers="content-type, x-custom")
+
+    assert response.status_code == 400
+    assert response.text == "Disallowed CORS headers"
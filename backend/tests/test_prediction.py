@@ -0,0 +1,45 @@
+"""
+Batch prediction equivalence
+predict_batch builds every precomputed response, so it must match predict
+"""
+
+import numpy as np
+import pytest
+
+from backend.services.prediction import prediction_service
+
+
+@pytest.fixture
+def service():
+    prediction_service.clear_cache()
+    yield prediction_service
+    prediction_service.clear_cache()
+
+
+def test_predict_batch_matches_predict(service):
+    sample_ids = [s["id"] for s in service.samples_db]
+    batch = service.predict_batch(sample_ids)
+
+    assert len(batch) == len(sample_ids)
+    for sample_id, batched in zip(sample_ids, batch):
+        service.clear_cache()
+        single = service.predict(sample_id)
+
+        assert batched.classification == single.classification
+        assert batched.confidence_score == single.confidence_score
+        assert batched.class_probabilities == single.class_probabilities
+        np.testing.assert_array_equal(batched.light_curve_data, single.light_curve_data)
+        np.testing.assert_array_equal(batched.time_points, single.time_points)
+        assert batched.highlighted_regions == single.highlighted_regions
+        np.testing.assert_array_equal(
+            batched.shap_explanation.feature_importance,
+            single.shap_explanation.feature_importance
+        )
+        assert batched.shap_explanation.model_dump(exclude={"feature_importance"}) == \
+            single.shap_explanation.model_dump(exclude={"feature_importance"})
+
+
+def test_predict_batch_unknown_id_raises(service):
+    with pytest.raises(ValueError):
+        service.predict_batch([service.samples_db[0]["id"], "no-such-sample"])
+    assert not service._response_cache
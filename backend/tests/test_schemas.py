@@ -0,0 +1,81 @@
+"""
+Response model round-trips
+Frozen models with ndarray fields must still pickle and JSON round-trip
+"""
+
+import pickle
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from backend.models.schemas import AnalysisMetadata, AnalysisResponse, SHAPExplanation, TransitRegion
+
+
+def _make_response() -> AnalysisResponse:
+    return AnalysisResponse(
+        classification="exoplanet",
+        confidence_score=0.93,
+        class_probabilities={"exoplanet": 0.93, "no_planet": 0.07},
+        light_curve_data=np.array([1.0, 0.99, np.nan, np.inf]),
+        time_points=np.linspace(0, 30, 4),
+        highlighted_regions=[TransitRegion(start_index=1, end_index=2, depth=0.01)],
+        analysis=AnalysisMetadata(star_name="Kepler-186f"),
+        shap_explanation=SHAPExplanation(
+            feature_importance=np.array([0.1, -0.2, 0.3, -np.inf]),
+            top_contributing_regions=[{"start_time": 10.0, "end_time": 20.0, "importance": 0.3}],
+            explanation_summary="summary",
+            base_value=0.5,
+            predicted_value=0.6
+        ),
+        model_version="CosmicNet-v1.0",
+        processing_time_ms=3
+    )
+
+
+def test_arrays_are_finite_and_read_only():
+    response = _make_response()
+    for array in (response.light_curve_data, response.time_points,
+                  response.shap_explanation.feature_importance):
+        assert np.isfinite(array).all()
+        assert not array.flags.writeable
+    assert response.light_curve_data.tolist() == [1.0, 0.99, 0.0, 1e10]
+
+    with pytest.raises(ValueError):
+        response.light_curve_data[0] = 2.0
+
+
+def test_input_arrays_stay_writeable():
+    feature_importance = np.array([0.1, -0.2, 0.3])
+    explanation = SHAPExplanation(
+        feature_importance=feature_importance,
+        top_contributing_regions=[],
+        explanation_summary="summary",
+        base_value=0.5,
+        predicted_value=0.6
+    )
+    # The model freezes its own view; the caller's array is untouched
+    assert feature_importance.flags.writeable
+    assert not explanation.feature_importance.flags.writeable
+    assert np.shares_memory(explanation.feature_importance, feature_importance)
+
+
+def test_models_are_frozen():
+    response = _make_response()
+    with pytest.raises(ValidationError):
+        response.confidence_score = 0.5
+    with pytest.raises(ValidationError):
+        response.highlighted_regions[0].depth = 0.5
+
+
+def test_pickle_round_trip():
+    response = _make_response()
+    restored = pickle.loads(pickle.dumps(response))
+    assert restored.model_dump_json() == response.model_dump_json()
+
+
+def test_json_round_trip():
+    response = _make_response()
+    restored = AnalysisResponse.model_validate_json(response.model_dump_json())
+    assert restored.model_dump_json() == response.model_dump_json()
+    assert isinstance(restored.light_curve_data, np.ndarray)